@@ -6,12 +6,56 @@ Module to fetch historical S&P 500 market data from Yahoo Finance using yfinance
 '''
 
 import os
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import yfinance as yf
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+# Chart-grade price data has no use for float64; float32 halves the frames
+# and the parquet cache files
+_PRICE_COLS = ['Open', 'High', 'Low', 'Close']
+
+# On-disk cache for downloaded histories. Ranges with a fixed end date never
+# change and are cached indefinitely; open-ended ranges (end_date=None) go
+# stale once today's bar moves, so they get a short TTL.
+_CACHE_DIR = Path('.cache')
+_CACHE_TTL_SECONDS = 3600
+
+
+def _cache_path(yf_ticker: str, start_date: str, end_date: str) -> Path:
+    key = hashlib.md5(f'{yf_ticker}|{start_date}|{end_date or "today"}'.encode()).hexdigest()
+    return _CACHE_DIR / f'{key}.parquet'
+
+
+def _load_cached_history(cache_path: Path, end_date: str):
+    '''Returns the cached DataFrame, or None if the cache is missing or stale.'''
+    if not cache_path.exists():
+        return None
+    if end_date is None and time.time() - cache_path.stat().st_mtime > _CACHE_TTL_SECONDS:
+        return None
+    return pd.read_parquet(cache_path)
 
 
-def get_yf_data(start_date: str = '2000-01-01', end_date: str = None, save_csv: bool = False,
+@functools.lru_cache(maxsize=128)
+def _get_asset_name(yf_ticker: str) -> str:
+    '''
+    Resolves the display name for a ticker.
+
+    The .info lookup is a separate HTTP round trip to Yahoo's quote-summary
+    endpoint, often slower than the price history itself; since ticker names
+    effectively never change, cache it for the life of the process.
+    '''
+    info = yf.Ticker(yf_ticker).info
+    return info.get("longName") or info.get("shortName") or yf_ticker
+
+
+def get_yf_data(start_date: str = '2000-01-01', end_date: str = None, save_parquet: bool = False,
                    yf_ticker: str = '^GSPC') -> Dict[str, Any]:
     '''
     Fetches historical S&P 500 data from Yahoo Finance.
@@ -19,35 +63,98 @@ def get_yf_data(start_date: str = '2000-01-01', end_date: str = None, save_csv:
     Parameters:
         start_date (str): Date in 'YYYY-MM-DD' format for the start of data.
         end_date (str): Date in 'YYYY-MM-DD' format for the end of data. If None, uses today's date.
-        save_csv (bool): Whether to save the DataFrame to a CSV file.
-        csv_filename (str): Filename for saving the CSV.
+        save_parquet (bool): Whether to save the DataFrame to a parquet file.
 
     Returns:
         pd.DataFrame: Historical data with dates as index.
     '''
+    # Key the filename on the ticker so saving never depends on the .info call
+    parquet_filename = f'{yf_ticker}_data.parquet'
+
+    cache_path = _cache_path(yf_ticker, start_date, end_date)
+    df = _load_cached_history(cache_path, end_date)
     try:
-        asset = yf.Ticker(yf_ticker)
-        info = asset.info
-        assetname = info.get("longName") or info.get("shortName") or yf_ticker
+        if df is not None:
+            assetname = _get_asset_name(yf_ticker)
+        else:
+            # Cold cache: the name lookup and the history download are separate
+            # HTTP round trips that release the GIL, so run them concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                name_future = pool.submit(_get_asset_name, yf_ticker)
+                history_future = pool.submit(yf.Ticker(yf_ticker).history,
+                                             start=start_date, end=end_date)
+                assetname = name_future.result()
+                df = history_future.result()
+
+            df = df.reset_index()  # so that Date becomes a column
+            # Normalize once at fetch time so downstream code can rely on a sorted,
+            # tz-naive Date column (the parquet cache round-trips this dtype)
+            df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_convert(None)
+            df = df.sort_values('Date').reset_index(drop=True)
+            df[_PRICE_COLS] = df[_PRICE_COLS].astype(np.float32)
+            _CACHE_DIR.mkdir(exist_ok=True)
+            df.to_parquet(cache_path)
     except Exception as e:
         print(f'Ticker "{yf_ticker}" not found.')
 
         return {'Error': e}
 
-    csv_filename = f'{assetname}_data.csv'
-    df = asset.history(start=start_date, end=end_date)
-    df = df.reset_index()  # so that Date becomes a column
-
-    if save_csv:
-        df.to_csv(csv_filename, index=False)
+    if save_parquet:
+        # Columnar, typed and compressed — much faster to write and re-read than CSV
+        df.to_parquet(parquet_filename, compression='zstd')
 
     return {'name': assetname, 'historics': df}
 
 
+def get_yf_data_batch(tickers: List[str], start_date: str = '2000-01-01',
+                      end_date: str = None) -> Dict[str, pd.DataFrame]:
+    '''
+    Fetches historical data for several tickers in one go.
+
+    Tickers already in the on-disk cache are served from there; the rest are
+    downloaded with a single concurrent yf.download call instead of serial
+    per-ticker history requests.
+
+    Parameters:
+        tickers (List[str]): Yahoo Finance ticker symbols.
+        start_date (str): Date in 'YYYY-MM-DD' format for the start of data.
+        end_date (str): Date in 'YYYY-MM-DD' format for the end of data. If None, uses today's date.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Per-ticker history frames keyed by ticker.
+    '''
+    frames = {}
+    missing = []
+    for ticker in tickers:
+        cached = _load_cached_history(_cache_path(ticker, start_date, end_date), end_date)
+        if cached is None:
+            missing.append(ticker)
+        else:
+            frames[ticker] = cached
+
+    if missing:
+        raw = yf.download(missing, start=start_date, end=end_date, threads=True,
+                          progress=False, auto_adjust=True, group_by='ticker')
+        _CACHE_DIR.mkdir(exist_ok=True)
+        for ticker in missing:
+            # Newer yfinance returns (Ticker, Price) MultiIndex columns even for
+            # a single ticker, older versions only for multi-ticker requests —
+            # check the column shape rather than the request size
+            df = raw[ticker] if isinstance(raw.columns, pd.MultiIndex) else raw
+            df = df.dropna(how='all').reset_index()
+            df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_convert(None)
+            df = df.sort_values('Date').reset_index(drop=True)
+            df[_PRICE_COLS] = df[_PRICE_COLS].astype(np.float32)
+            df.to_parquet(_cache_path(ticker, start_date, end_date))
+            frames[ticker] = df
+
+    return frames
+
+
 if __name__ == '__main__':
-    # Example: fetch data from 2000 to today and save it to CSV.
-    result = get_yf_data(save_csv=True)
-    if 'Error' in result.keys():
+    # Example: fetch data from 2000 to today and save it to parquet.
+    result = get_yf_data(save_parquet=True)
+    if 'Error' in result:
         print(result['Error'])
     else:
-        print(f'Downloaded {len(result['historics'])} rows of data.')
+        print(f"Downloaded {len(result['historics'])} rows of data.")
@@ -19,102 +19,210 @@ by the entry cost and spread. The simulation returns a DataFrame with Date, Long
 Short Value, and Combined Portfolio Value.
 '''
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
-def simulate_pair_strategy(df: pd.DataFrame,
-                           start_date: str,
-                           multiplier: float = 3.0,
-                           long_barrier_pct: float = 0.10,
-                           short_barrier_pct: float = 0.10,
-                           initial_investment: float = 100.0,
-                           entry_cost: float = 5.0,
-                           spread: float = 3.0) -> pd.DataFrame:
+
+if _HAS_NUMBA:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _simulate_core(close, low, high, entry_price, net_investment, multiplier,
+                       long_knockout_level, short_knockout_level):
+        '''
+        Sequential day-by-day simulation kernel on raw float arrays.
+
+        Keeps the explicit loop (handy for adding path-dependent features like
+        trailing stops) but compiled to native code by Numba, so there is no
+        interpreter or pandas dispatch overhead per day. The long and short legs
+        share no state, so prange runs them on separate threads. cache=True
+        persists the compiled kernel across process restarts.
+        '''
+        n = close.shape[0]
+        out = np.empty((2, n), dtype=close.dtype)
+
+        # Loop invariants: fold the division by entry_price and the leverage
+        # factor into a single multiplier computed once
+        lev = multiplier / entry_price
+
+        for side in prange(2):
+            vals = out[side]
+            vals[0] = net_investment
+            active = True
+            for i in range(1, n):
+                if not active:
+                    vals[i] = 0.0
+                elif side == 0:
+                    if low[i] <= long_knockout_level:
+                        vals[i] = 0.0
+                        active = False
+                    else:
+                        vals[i] = max(net_investment * (1 + lev * (close[i] - entry_price)), 0.0)
+                else:
+                    if high[i] >= short_knockout_level:
+                        vals[i] = 0.0
+                        active = False
+                    else:
+                        vals[i] = max(net_investment * (1 + lev * (entry_price - close[i])), 0.0)
+
+        return out[0], out[1]
+
+
+def simulate_core(df: pd.DataFrame,
+                  start_date: str,
+                  multiplier: float = 3.0,
+                  long_barrier_pct: float = 0.10,
+                  short_barrier_pct: float = 0.10,
+                  initial_investment: float = 100.0,
+                  entry_cost: float = 5.0,
+                  spread: float = 3.0,
+                  mode: str = 'absolute'):
     '''
-    Simulates the performance of a paired knockout certificate strategy.
+    Simulates the paired knockout strategy and returns raw NumPy arrays.
+
+    Skips all result-DataFrame construction, which makes this the right entry
+    point for parameter sweeps; simulate_pair_strategy wraps it for display use.
 
     Parameters:
-        df (pd.DataFrame): Historical market data containing at least 'Date', 'Close', 'High', and 'Low'.
-        start_date (str): The entry date in 'YYYY-MM-DD' format.
+        df (pd.DataFrame): Historical market data containing at least 'Date', 'Close', 'High',
+            and 'Low', sorted by a tz-naive 'Date' column (as returned by data_fetch.get_yf_data).
+        start_date (str or pd.Timestamp): The entry date ('YYYY-MM-DD' if a string).
         multiplier (float): Leverage factor (e.g. 3.0 for 3× exposure).
         long_barrier_pct (float): Knockout barrier for the long position (e.g. 0.10 for 10% drop).
         short_barrier_pct (float): Knockout barrier for the short position (e.g. 0.10 for 10% rise).
         initial_investment (float): Starting capital allocated to each certificate.
         entry_cost (float): Fixed cost to enter each position.
         spread (float): Transaction spread cost for each position.
+        mode (str): 'absolute' values each certificate off the total move from the
+            entry price; 'compound' compounds the leveraged daily returns instead.
 
     Returns:
-        pd.DataFrame: DataFrame with columns 'Date', 'Long Value', 'Short Value', and 'Combined Value'.
+        tuple: (dates, long_vals, short_vals, combined_vals) NumPy arrays.
     '''
-    # Convert 'Date' to datetime (assume UTC) and sort the DataFrame
-    df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_convert(None)
-    df = df.sort_values('Date').reset_index(drop=True)
-    
     start_date_dt = pd.to_datetime(start_date)
-    sim_df = df[df['Date'] >= start_date_dt].copy().reset_index(drop=True)
+    # Dates are sorted, so bisect to the start row instead of scanning a boolean mask
+    start_idx = df['Date'].searchsorted(start_date_dt)
+    sim_df = df.iloc[start_idx:].reset_index(drop=True)
     
     if sim_df.empty:
         raise ValueError('No data available from the specified start date.')
     
+    # Work on raw NumPy arrays instead of per-row pandas lookups. float32 is
+    # plenty of precision for chart-grade portfolio values and halves the
+    # memory traffic through the vectorized kernels.
+    close = sim_df['Close'].to_numpy(dtype=np.float32)
+    low = sim_df['Low'].to_numpy(dtype=np.float32)
+    high = sim_df['High'].to_numpy(dtype=np.float32)
+    n = len(sim_df)
+
     # Use the entry price from the 'Close' on the entry date
-    entry_price = sim_df.iloc[0]['Close']
-    
+    entry_price = close[0]
+
     # Deduct entry cost and spread from the initial investment for each certificate
     net_investment = initial_investment - (entry_cost + spread)
-    
-    # Initialize the columns for the two positions with net_investment at day 0
-    sim_df['Long Value'] = 0.0
-    sim_df['Short Value'] = 0.0
-    sim_df['Combined Value'] = 0.0
-    
+
     # Set knockout thresholds based on the entry price
     long_knockout_level = entry_price * (1 - long_barrier_pct)
     short_knockout_level = entry_price * (1 + short_barrier_pct)
-    
-    # Initialize active flags for both positions
-    long_active = True
-    short_active = True
-    
-    # Initialize the first day
-    sim_df.at[0, 'Long Value'] = net_investment
-    sim_df.at[0, 'Short Value'] = net_investment
-    sim_df.at[0, 'Combined Value'] = net_investment * 2
-    
-    # Simulate day-by-day performance
-    for i in range(1, len(sim_df)):
-        current_close = sim_df.at[i, 'Close']
-        day_low = sim_df.at[i, 'Low']
-        day_high = sim_df.at[i, 'High']
-
-        # Long certificate
-        if long_active:
-            if day_low <= long_knockout_level:
-                sim_df.at[i, 'Long Value'] = 0.0
-                long_active = False
-            else:
-                long_return = (current_close - entry_price) / entry_price
-                new_long = net_investment * (1 + multiplier * long_return)
-                sim_df.at[i, 'Long Value'] = max(new_long, 0.0)
-        else:
-            sim_df.at[i, 'Long Value'] = 0.0
-
-        # Short certificate
-        if short_active:
-            if day_high >= short_knockout_level:
-                sim_df.at[i, 'Short Value'] = 0.0
-                short_active = False
-            else:
-                short_return = (entry_price - current_close) / entry_price
-                new_short = net_investment * (1 + multiplier * short_return)
-                sim_df.at[i, 'Short Value'] = max(new_short, 0.0)
+
+    if mode not in ('absolute', 'compound'):
+        raise ValueError("mode must be 'absolute' or 'compound'.")
+
+    if mode == 'absolute' and _HAS_NUMBA:
+        long_vals, short_vals = _simulate_core(close, low, high, entry_price,
+                                               net_investment, multiplier,
+                                               long_knockout_level, short_knockout_level)
+    else:
+        # Vectorized NumPy path: the first barrier crossing knocks out the
+        # position for good, so the knockout day is simply the first True in the
+        # boolean hit arrays. Day 0 is the entry day and is never checked
+        # against the barriers.
+        long_hits = low <= long_knockout_level
+        long_hits[0] = False
+        short_hits = high >= short_knockout_level
+        short_hits[0] = False
+
+        if mode == 'compound':
+            # Compound the leveraged daily returns with a cumulative product.
+            # Each daily factor is clamped at zero — both for the first barrier
+            # hit and for a leveraged daily loss beyond -100% — so the running
+            # product absorbs at zero and stays there, matching the per-day
+            # max(prev * factor, 0.0) recurrence. An unclamped negative factor
+            # would flip the product's sign and let a dead position resurrect.
+            ret = np.empty_like(close)
+            ret[0] = 0.0
+            ret[1:] = close[1:] / close[:-1] - 1
+            long_factor = np.maximum(np.where(np.cumsum(long_hits) >= 1, 0.0, 1 + multiplier * ret), 0.0)
+            short_factor = np.maximum(np.where(np.cumsum(short_hits) >= 1, 0.0, 1 - multiplier * ret), 0.0)
+            long_vals = net_investment * np.cumprod(long_factor)
+            short_vals = net_investment * np.cumprod(short_factor)
         else:
-            sim_df.at[i, 'Short Value'] = 0.0
+            long_ko_idx = long_hits.argmax() if long_hits.any() else n
+            short_ko_idx = short_hits.argmax() if short_hits.any() else n
 
-        # Combined portfolio is the sum of long and short positions
-        sim_df.at[i, 'Combined Value'] = sim_df.at[i, 'Long Value'] + sim_df.at[i, 'Short Value']
-    
-    return sim_df[['Date', 'Long Value', 'Short Value', 'Combined Value']]
+            # Full trajectories, floored at zero and masked to zero from the
+            # knockout day on — one branch-free pass per position
+            days = np.arange(n)
+            long_traj = np.maximum(net_investment * (1 + multiplier * (close - entry_price) / entry_price), 0.0)
+            short_traj = np.maximum(net_investment * (1 + multiplier * (entry_price - close) / entry_price), 0.0)
+            long_vals = np.where(days < long_ko_idx, long_traj, 0.0)
+            short_vals = np.where(days < short_ko_idx, short_traj, 0.0)
+
+    return sim_df['Date'].to_numpy(), long_vals, short_vals, long_vals + short_vals
+
+
+def simulate_pair_strategy(df: pd.DataFrame,
+                           start_date: str,
+                           multiplier: float = 3.0,
+                           long_barrier_pct: float = 0.10,
+                           short_barrier_pct: float = 0.10,
+                           initial_investment: float = 100.0,
+                           entry_cost: float = 5.0,
+                           spread: float = 3.0,
+                           mode: str = 'absolute') -> pd.DataFrame:
+    '''
+    Simulates the performance of a paired knockout certificate strategy.
+
+    Thin wrapper around simulate_core that packages the result arrays into a
+    DataFrame for display; parameters are documented there.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns 'Date', 'Long Value', 'Short Value', and 'Combined Value'.
+    '''
+    dates, long_vals, short_vals, combined_vals = simulate_core(
+        df,
+        start_date,
+        multiplier=multiplier,
+        long_barrier_pct=long_barrier_pct,
+        short_barrier_pct=short_barrier_pct,
+        initial_investment=initial_investment,
+        entry_cost=entry_cost,
+        spread=spread,
+        mode=mode
+    )
+    return pd.DataFrame({'Date': dates,
+                         'Long Value': long_vals,
+                         'Short Value': short_vals,
+                         'Combined Value': combined_vals})
+
+
+if _HAS_NUMBA:
+    # Warm up the kernel on dummy data so the one-off JIT compile happens at
+    # process start instead of on the first user click. The argument dtypes
+    # mirror the real call (float32 arrays, float32 entry/levels); together
+    # with cache=True, later launches load the compiled object straight from
+    # the cache and skip LLVM entirely.
+    try:
+        _warm = np.zeros(2, dtype=np.float32)
+        _simulate_core(_warm, _warm, _warm, np.float32(1.0), 1.0, 1.0,
+                       np.float32(0.5), np.float32(1.5))
+    except Exception:
+        pass
 
 
 if __name__ == '__main__':
@@ -125,7 +233,11 @@ if __name__ == '__main__':
     except FileNotFoundError:
         print('Data file not found. Please run data_fetch.py first.')
         exit(1)
-    
+
+    # CSV dates come back as strings; normalize them the way get_yf_data does
+    data['Date'] = pd.to_datetime(data['Date'], utc=True).dt.tz_convert(None)
+    data = data.sort_values('Date').reset_index(drop=True)
+
     results = simulate_pair_strategy(data,
                                      start_date='2025-04-01',
                                      multiplier=10.0,
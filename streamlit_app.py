@@ -13,11 +13,98 @@ Below the plot, a merged result table is shown that includes dates, knockout val
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
-from data_fetch import get_yf_data
-from simulation import simulate_pair_strategy
+# plotly and data_fetch (which pulls in yfinance) are imported lazily where
+# they are first needed: both are heavyweight imports that would otherwise run
+# on every cold page render, before the user ever clicks Run Simulation.
+from simulation import simulate_core
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_yf_data(start_date: str, yf_ticker: str):
+    '''Memoizes the yfinance fetch so widget tweaks and reruns skip the network.'''
+    from data_fetch import get_yf_data
+
+    return get_yf_data(start_date=start_date, save_parquet=False, yf_ticker=yf_ticker)
+
+
+@st.cache_data(ttl=3600)
+def _cached_simulation(df, start_date, multiplier, long_barrier_pct, short_barrier_pct,
+                       initial_investment, entry_cost, spread, mode):
+    '''
+    Memoizes the simulation keyed on the data and all parameters.
+
+    Calls the array-level simulate_core so no intermediate result DataFrame is
+    built at the call boundary; main() assembles the display frame once.
+    '''
+    return simulate_core(
+        df,
+        start_date=start_date,
+        multiplier=multiplier,
+        long_barrier_pct=long_barrier_pct,
+        short_barrier_pct=short_barrier_pct,
+        initial_investment=initial_investment,
+        entry_cost=entry_cost,
+        spread=spread,
+        mode=mode
+    )
+
+
+def _make_fig(merged_df, asset_name, long_knockout_norm, short_knockout_norm,
+              in_the_money_value):
+    '''
+    Builds the two-axis performance chart as an interactive plotly figure.
+
+    Scattergl traces render client-side with WebGL, so the server only ships
+    JSON instead of rasterizing a PNG on every run, and the chart gains
+    zoom/pan/hover for free. This replaces the earlier matplotlib figure-reuse
+    machinery, which existed purely to dodge server-side redraw cost.
+    '''
+    import plotly.graph_objects as go
+
+    norm_col = f'Normalized {asset_name}'
+    x_span = [merged_df['Date'].iloc[0], merged_df['Date'].iloc[-1]]
+
+    fig = go.Figure()
+    # Combined knockout strategy on the left axis, normalized asset on the right
+    fig.add_trace(go.Scattergl(x=merged_df['Date'], y=merged_df['Combined Value'],
+                               name='Combined Knockout Portfolio',
+                               line=dict(color='blue')))
+    fig.add_trace(go.Scattergl(x=merged_df['Date'], y=merged_df[norm_col],
+                               name=norm_col, yaxis='y2',
+                               line=dict(color='red', dash='dash')))
+
+    # Daily range is optional (see the Show Daily High/Low Range checkbox)
+    if 'Normalized High' in merged_df.columns:
+        fig.add_trace(go.Scattergl(x=merged_df['Date'], y=merged_df['Normalized High'],
+                                   name='Normalized High', yaxis='y2', mode='lines',
+                                   line=dict(color='salmon', width=1)))
+        fig.add_trace(go.Scattergl(x=merged_df['Date'], y=merged_df['Normalized Low'],
+                                   name='Normalized Low', yaxis='y2', mode='lines',
+                                   line=dict(color='salmon', width=1)))
+
+    # Reference levels: knockout barriers on the normalized axis, the
+    # "in the money" value on the portfolio axis
+    fig.add_trace(go.Scattergl(x=x_span, y=[long_knockout_norm] * 2, yaxis='y2',
+                               name='Long Knockout Value', mode='lines',
+                               line=dict(color='grey', dash='dot')))
+    fig.add_trace(go.Scattergl(x=x_span, y=[short_knockout_norm] * 2, yaxis='y2',
+                               name='Short Knockout Value', mode='lines',
+                               line=dict(color='grey', dash='dot')))
+    fig.add_trace(go.Scattergl(x=x_span, y=[in_the_money_value] * 2,
+                               name='In the Money Value', mode='lines',
+                               line=dict(color='green', dash='dashdot')))
+
+    fig.update_layout(
+        title=f'Paired Knockout Strategy vs. Normalized {asset_name} Performance',
+        xaxis=dict(title='Date'),
+        yaxis=dict(title='Knockout Portfolio Value ($)', color='blue'),
+        yaxis2=dict(title=f'{norm_col} Value ($)', color='red',
+                    overlaying='y', side='right'),
+        legend=dict(orientation='h', yanchor='top', y=-0.25, xanchor='center', x=0.5)
+    )
+    return fig
 
 
 def main():
@@ -44,102 +131,108 @@ def main():
                                                    min_value=1.0, value=100.0, step=10.0)
     entry_cost = st.sidebar.number_input('Entry/Exit Cost ($)', min_value=0.0, value=5.0, step=0.5)
     spread = st.sidebar.number_input('Spread ($)', min_value=0.0, value=3.0, step=0.5)
+    mode = st.sidebar.selectbox('Valuation Mode', ('absolute', 'compound'),
+                                help='absolute values each certificate off the total move from '
+                                     'the entry price; compound compounds the leveraged daily returns.')
+
+    show_range = st.sidebar.checkbox('Show Daily High/Low Range', value=False)
+
+    # Plot reference levels, derived once from the sidebar inputs: the knockout
+    # barriers on the normalized axis and the break-even ("in the money") value
+    # on the portfolio axis
+    long_knockout_norm = initial_investment * (1 - long_barrier_pct)
+    short_knockout_norm = initial_investment * (1 + short_barrier_pct)
+    in_the_money_value = 2 * (initial_investment + (entry_cost + spread))
 
     if st.sidebar.button('Run Simulation'):
-        with st.spinner('Fetching historical data and running simulation...'):
-            # Fetch historical data
-            result = get_yf_data(start_date='2000-01-01', save_csv=False, yf_ticker=asset)
-            if 'Error' in result.keys():
-                st.error(f'Ticker not found: {asset}')
-                st.stop()
-            else:
-                df = result['historics']
-                asset_name = result['name']
-
-            # Run paired knockout simulation
-            sim_df = simulate_pair_strategy(
-                df,
-                start_date=start_date.strftime('%Y-%m-%d'),
-                multiplier=multiplier,
-                long_barrier_pct=long_barrier_pct,
-                short_barrier_pct=short_barrier_pct,
-                initial_investment=initial_investment,
-                entry_cost=entry_cost,
-                spread=spread
-            )
-            # For comparison: process the original asset data from the simulation start date onward
-            df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_convert(None)
-            df = df.sort_values('Date').reset_index(drop=True)
-            start_date_dt = pd.to_datetime(start_date.strftime('%Y-%m-%d'))
-            comp_df = df[df['Date'] >= start_date_dt].copy().reset_index(drop=True)
-            
-            # Calculate the normalized close
-            entry_price = comp_df.iloc[0]['Close']
-            comp_df[f'Normalized {asset_name}'] = initial_investment * (comp_df['Close'] / entry_price)
-            
-            # Add normalized High/Low for the daily vertical lines
-            comp_df['Normalized High'] = initial_investment * (comp_df['High'] / entry_price)
-            comp_df['Normalized Low'] = initial_investment * (comp_df['Low'] / entry_price)
-            
-            # Merge the simulation results with the normalized asset data (including high/low)
-            merged_df = pd.merge(
-                sim_df,
-                comp_df[['Date', f'Normalized {asset_name}', 'Normalized High', 'Normalized Low']],
-                on='Date',
-                how='left'
-            )
+        # Whole-pipeline cache: if no parameter changed since the last run,
+        # reuse the stored results and figure instead of redoing fetch,
+        # simulation and plotting on the rerun
+        run_key = (asset, start_date.isoformat(), multiplier, long_barrier_pct,
+                   short_barrier_pct, initial_investment, entry_cost, spread, mode,
+                   show_range)
+        if st.session_state.get('run_key') == run_key:
+            merged_df = st.session_state['run_df']
+            fig = st.session_state['run_fig']
+            asset_name = st.session_state['run_asset_name']
+            norm_col = f'Normalized {asset_name}'
+        else:
+            # One Timestamp for both the simulation and the comparison slice —
+            # no strftime/parse round trips through strings
+            start_ts = pd.Timestamp(start_date)
+            with st.spinner('Fetching historical data and running simulation...'):
+                # Fetch historical data (cached across reruns)
+                result = _cached_yf_data('2000-01-01', asset)
+                if 'Error' in result:
+                    st.error(f'Ticker not found: {asset}')
+                    st.stop()
+                else:
+                    # Only Date/Close/High/Low are used downstream; drop the rest early
+                    df = result['historics'][['Date', 'Close', 'High', 'Low']]
+                    asset_name = result['name']
+                    norm_col = f'Normalized {asset_name}'
+
+                # Run paired knockout simulation (cached across reruns)
+                dates, long_vals, short_vals, combined_vals = _cached_simulation(
+                    df,
+                    start_date=start_ts,
+                    multiplier=multiplier,
+                    long_barrier_pct=long_barrier_pct,
+                    short_barrier_pct=short_barrier_pct,
+                    initial_investment=initial_investment,
+                    entry_cost=entry_cost,
+                    spread=spread,
+                    mode=mode
+                )
+                # For comparison: process the original asset data from the simulation
+                # start date onward (Date is already tz-naive and sorted at fetch time)
+                start_idx = df['Date'].searchsorted(start_ts)
+                comp_df = df.iloc[start_idx:].reset_index(drop=True)
+
+                # Calculate the normalized close: one scalar factor and one
+                # multiply per column on the raw arrays, no intermediate Series
+                entry_price = comp_df.iloc[0]['Close']
+                norm_factor = initial_investment / entry_price
+
+                # The simulation and comp_df are sliced from the same sorted frame
+                # at the same start date, so all arrays are row-aligned by
+                # construction; assemble the result frame in one constructor call.
+                # The daily range columns are only materialized when requested.
+                assert len(dates) == len(comp_df)
+                merged_data = {'Date': dates,
+                               'Long Value': long_vals,
+                               'Short Value': short_vals,
+                               'Combined Value': combined_vals,
+                               norm_col: comp_df['Close'].to_numpy() * norm_factor}
+                if show_range:
+                    merged_data['Normalized High'] = comp_df['High'].to_numpy() * norm_factor
+                    merged_data['Normalized Low'] = comp_df['Low'].to_numpy() * norm_factor
+                merged_df = pd.DataFrame(merged_data)
+
+            # Plot with two y-axes on the session's persistent figure
+            fig = _make_fig(merged_df, asset_name, long_knockout_norm,
+                            short_knockout_norm, in_the_money_value)
+
+            st.session_state['run_key'] = run_key
+            st.session_state['run_df'] = merged_df
+            st.session_state['run_fig'] = fig
+            st.session_state['run_asset_name'] = asset_name
 
         st.success('Simulation complete!')
-
-        # Create a plot with two y-axes
-        fig, ax1 = plt.subplots(figsize=(10, 5))
-        ax2 = ax1.twinx()
-
-        # Plot combined knockout strategy on the left axis
-        ax1.plot(merged_df['Date'], merged_df['Combined Value'],
-                 color='blue', label='Combined Knockout Portfolio')
-        ax1.set_xlabel('Date')
-        ax1.set_ylabel('Knockout Portfolio Value ($)', color='blue')
-        ax1.tick_params(axis='y', labelcolor='blue')
-
-        # Plot normalized asset line
-        ax2.plot(merged_df['Date'], merged_df[f'Normalized {asset_name}'],
-                 color='red', linestyle='--', label=f'Normalized {asset_name}')
-
-        # Add horizontal lines for knockout levels on the normalized axis
-        long_knockout_norm = initial_investment * (1 - long_barrier_pct)
-        short_knockout_norm = initial_investment * (1 + short_barrier_pct)
-        ax2.axhline(long_knockout_norm, color='grey', linestyle=':', label='Long Knockout Value')
-        ax2.axhline(short_knockout_norm, color='grey', linestyle=':', label='Short Knockout Value')
-
-        # Add horizontal line for the "in the money" value on the left axis
-        in_the_money_value = 2 * (initial_investment + (entry_cost + spread))
-        ax1.axhline(in_the_money_value, color='green', linestyle='-.', label='In the Money Value')
-        # ---------------------
-
-        ax2.set_ylabel(f'Normalized {asset_name} Value ($)', color='red')
-        ax2.tick_params(axis='y', labelcolor='red')
-
-        # Add legend for both axes
-        lines_1, labels_1 = ax1.get_legend_handles_labels()
-        lines_2, labels_2 = ax2.get_legend_handles_labels()
-        ax2.legend(
-            lines_1 + lines_2,
-            labels_1 + labels_2,
-            loc='upper center',
-            bbox_to_anchor=(0.5, -0.35),
-            ncol=2  # Optional: number of columns if you want a horizontal legend
-            )
-
-        ax1.set_title(f'Paired Knockout Strategy vs. Normalized {asset_name} Performance')
-        fig.autofmt_xdate(rotation=45)
-        fig.tight_layout()
-        st.pyplot(fig)
-
-        # Always display the merged result table below the plot
-        st.subheader('Simulation Results')
-        st.dataframe(merged_df[['Date', 'Long Value', 'Short Value', 'Combined Value', 
-                                f'Normalized {asset_name}']].reset_index(drop=True))
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Show only the most recent rows — serializing the full history to the
+        # browser costs more than the simulation itself. The complete table
+        # stays available as a parquet download.
+        st.subheader('Simulation Results (last 250 trading days)')
+        # Arrow-backed dtypes let Streamlit serialize the table without a
+        # NumPy-to-Arrow conversion on every render
+        display_df = merged_df[['Date', 'Long Value', 'Short Value', 'Combined Value',
+                                norm_col]].convert_dtypes(dtype_backend='pyarrow')
+        st.dataframe(display_df.tail(250), use_container_width=True, hide_index=True)
+        st.download_button('Download full results (parquet)',
+                           data=display_df.to_parquet(),
+                           file_name='simulation_results.parquet')
 
 if __name__ == '__main__':
     main()